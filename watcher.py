@@ -12,94 +12,190 @@ import re
 import sys
 import time
 import json
-import subprocess
-import requests
+import logging
+import logging.handlers
+import atexit
+import queue
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+import urllib3
 from collections import deque
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Final, Optional, Dict, Any, Callable, NamedTuple
 
 # ============================================================================
 # CONFIGURATION - Load from environment variables
 # ============================================================================
 
-SLACK_WEBHOOK_URL = os.environ.get('SLACK_WEBHOOK_URL', '')
-ERROR_RATE_THRESHOLD = float(os.environ.get('ERROR_RATE_THRESHOLD', '2.0'))
-WINDOW_SIZE = int(os.environ.get('WINDOW_SIZE', '200'))
-ALERT_COOLDOWN_SEC = int(os.environ.get('ALERT_COOLDOWN_SEC', '300'))
-MAINTENANCE_MODE = os.environ.get('MAINTENANCE_MODE', 'false').lower() == 'true'
-LOG_FILE = '/var/log/nginx/access.log'
-MAINTENANCE_FLAG_FILE = '/app/state/maintenance.flag'
-BREACH_LOG_FILE = '/app/state/error_rate_breaches.log'
+SLACK_WEBHOOK_URL: Final[str] = os.environ.get('SLACK_WEBHOOK_URL', '')
+ERROR_RATE_THRESHOLD: Final[float] = float(os.environ.get('ERROR_RATE_THRESHOLD', '2.0'))
+WINDOW_SIZE: Final[int] = int(os.environ.get('WINDOW_SIZE', '200'))
+ALERT_COOLDOWN_SEC: Final[int] = int(os.environ.get('ALERT_COOLDOWN_SEC', '300'))
+MAINTENANCE_MODE: Final[bool] = os.environ.get('MAINTENANCE_MODE', 'false').lower() == 'true'
+LOG_LEVEL_NAMES: Final = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+_log_level_env = (os.environ.get('LOG_LEVEL') or 'INFO').upper()
+LOG_LEVEL: Final[str] = _log_level_env if _log_level_env in LOG_LEVEL_NAMES else 'INFO'
+LOG_FILE: Final[str] = '/var/log/nginx/access.log'
+MAINTENANCE_FLAG_FILE: Final[str] = '/app/state/maintenance.flag'
+BREACH_LOG_FILE: Final[str] = '/app/state/error_rate_breaches.log'
+MAINTENANCE_CHECK_TTL_SEC: Final[float] = 1.0
+BREACH_FILE_CHECK_TTL_SEC: Final[float] = 1.0
+READ_CHUNK_SIZE: Final[int] = 64 * 1024
+# Read blocks waiting for the parser thread: at most 4 MiB, i.e. 64 blocks
+# of READ_CHUNK_SIZE, before the reader blocks
+BATCH_QUEUE_BYTES: Final[int] = 4 * 1024 * 1024
+BATCH_QUEUE_SIZE: Final[int] = BATCH_QUEUE_BYTES // READ_CHUNK_SIZE
+ALERT_FLUSH_TIMEOUT_SEC: Final[int] = 10
+
+# Smallest error count that exceeds ERROR_RATE_THRESHOLD in a full window
+_ERROR_COUNT_TRIGGER: Final[int] = int(WINDOW_SIZE * ERROR_RATE_THRESHOLD / 100) + 1
 
 # ============================================================================
-# STATE MANAGEMENT
+# LOGGING
 # ============================================================================
 
-# Sliding window to track recent requests
-request_window = deque(maxlen=WINDOW_SIZE)
+# Console output goes through a queue: the tail loop only enqueues records,
+# and a listener thread formats and writes them to stdout. Records below
+# LOG_LEVEL are dropped before any formatting happens.
+log = logging.getLogger('watcher')
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records as-is, leaving formatting to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message on the emitting thread.
+        # The listener runs in this process, so the record can go unchanged;
+        # log arguments are never mutated after the call
+        return record
+
+
+_log_q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+log.addHandler(_DeferredQueueHandler(_log_q))
 
-# Track the last known pool to detect changes
-last_known_pool: Optional[str] = None
+_log_listener = logging.handlers.QueueListener(_log_q, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+# Registered first so it stops last, after the other exit hooks have logged
+atexit.register(_log_listener.stop)
 
-# Track last alert times to implement cooldown
-last_alert_times: Dict[str, datetime] = {
-    'failover': datetime.min,
-    'error_rate': datetime.min,
-    'recovery': datetime.min
+if LOG_LEVEL != _log_level_env:
+    log.warning("[WARNING] Unknown LOG_LEVEL %r - using %s (valid: %s)", _log_level_env, LOG_LEVEL, ', '.join(LOG_LEVEL_NAMES))
+
+# ============================================================================
+# STATE MANAGEMENT
+# ============================================================================
+
+class WindowEntry(NamedTuple):
+    """A single request as kept in the snippet history."""
+    pool: str
+    release: str
+    status: str
+    is_error: bool
+    upstream_status: str
+    request_time: str
+    upstream_response_time: str
+    method: str
+    uri: str
+    upstream: str
+
+
+# Number of recent requests kept in full for Slack log snippets
+SNIPPET_HISTORY: Final[int] = 20
+
+# Track last alert times (time.monotonic() seconds) to implement cooldown
+last_alert_times: Dict[str, float] = {
+    'failover': float('-inf'),
+    'error_rate': float('-inf'),
+    'recovery': float('-inf')
 }
 
-# Track if we've seen a failover (to detect recovery)
-failover_occurred = False
-failover_from_pool: Optional[str] = None
+# Blocks of complete log lines, read by the tail loop and parsed by a
+# separate thread; bounded so a parsing backlog pushes back on reading
+_batch_q: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=BATCH_QUEUE_SIZE)
+
+# A queued alert: (alert_type, message, details, error_stats, log_snippet)
+AlertItem = tuple[str, str, Dict[str, Any], tuple[float, int, int], Optional[str]]
+
+# Outgoing Slack alerts, built and posted by a background worker so the
+# tail loop never waits on message encoding or network I/O
+_alert_q: "queue.Queue[Optional[AlertItem]]" = queue.Queue(maxsize=64)
+
+# Keep-alive connection pool for the webhook host, set up once at import.
+# Failed connects are retried with a short backoff; POSTs that reached
+# Slack are not, since Retry excludes POST from read retries by default
+# (no duplicate alerts)
+_slack_pool = urllib3.connection_from_url(
+    SLACK_WEBHOOK_URL,
+    maxsize=1,
+    block=False,
+    timeout=urllib3.Timeout(connect=3, read=5),
+    retries=urllib3.Retry(total=2, backoff_factor=0.1)
+) if SLACK_WEBHOOK_URL else None
+_slack_path = urllib3.util.parse_url(SLACK_WEBHOOK_URL).request_uri if SLACK_WEBHOOK_URL else '/'
+
+# Last maintenance flag file check: (time.monotonic() of check, flag present)
+_maint_cache: tuple[float, bool] = (float('-inf'), False)
+
+# Breach log handle, kept open between breaches (see _get_breach_fh)
+_breach_fh = None
+_breach_checked_at = float('-inf')  # time.monotonic() of the last rotation check
 
 # ============================================================================
 # LOG PARSING
 # ============================================================================
 
-# Regex pattern to parse the detailed log format
-# Format: pool=<pool> release=<release> status=<status> upstream_status=<upstream_status> ...
-LOG_PATTERN = re.compile(
-    r'pool=(?P<pool>[^\s]*)\s+'
-    r'release=(?P<release>[^\s]*)\s+'
-    r'status=(?P<status>\d+)\s+'
-    r'upstream_status=(?P<upstream_status>[^\s]*)\s+'
-    r'upstream=(?P<upstream>[^\s]*)\s+'
-    r'request_time=(?P<request_time>[^\s]*)\s+'
-    r'upstream_response_time=(?P<upstream_response_time>[^\s]*)\s+'
-    r'method=(?P<method>[^\s]*)\s+'
-    r'uri=(?P<uri>[^\s]*)\s+'
-    r'time=(?P<time>[^\s]*)'
+# Anchored, precompiled pattern for the detailed format. Single-value fields
+# are \S*; multi-value fields written on retries ("upstream_status=502, 200")
+# are [^=]*, which stops at the next key's "=" so backtracking is bounded to
+# that key's name.
+LOG_PATTERN: Final = re.compile(
+    r'pool=(?P<pool>\S*) '
+    r'release=(?P<release>\S*) '
+    r'status=(?P<status>\S*) '
+    r'upstream_status=(?P<upstream_status>[^=]*) '
+    r'upstream=(?P<upstream>[^=]*) '
+    r'request_time=(?P<request_time>\S*) '
+    r'upstream_response_time=(?P<upstream_response_time>[^=]*) '
+    r'method=(?P<method>\S*) '
+    r'uri=(?P<uri>\S*) '
+    r'time=(?P<time>\S*)',
+    re.ASCII
 )
 
 
-def parse_log_line(line: str) -> Optional[Dict[str, Any]]:
+def parse_log_line(line: str, _match=LOG_PATTERN.match, _intern=sys.intern) -> Optional[Dict[str, Any]]:
     """
     Parse a log line and extract relevant fields.
 
+    The underscore defaults pre-bind LOG_PATTERN.match and sys.intern as
+    fast locals.
+
     Args:
         line: Raw log line from Nginx
 
     Returns:
         Dictionary with parsed fields or None if parsing fails
     """
-    match = LOG_PATTERN.match(line.strip())
+    match = _match(line)
     if not match:
         return None
 
     data = match.groupdict()
 
-    # Convert status to integer
-    try:
-        data['status'] = int(data['status'])
-    except (ValueError, TypeError):
-        data['status'] = 0
+    # Pool and release take only a handful of values; interning them makes
+    # the per-line pool comparisons identity checks and shares one copy
+    data['pool'] = _intern(data['pool'])
+    data['release'] = _intern(data['release'])
 
-    # Parse upstream_status (can be multiple values like "502, 200")
-    try:
-        upstream_statuses = data['upstream_status'].split(',')
-        data['upstream_status_codes'] = [int(s.strip()) for s in upstream_statuses if s.strip().isdigit()]
-    except (ValueError, AttributeError):
-        data['upstream_status_codes'] = []
+    # 5xx check on the raw status string; the status is only ever displayed,
+    # so it is never converted to int
+    status = data['status']
+    data['is_error'] = len(status) == 3 and status[0] == '5'
 
     return data
 
@@ -108,135 +204,137 @@ def parse_log_line(line: str) -> Optional[Dict[str, Any]]:
 # SLACK NOTIFICATION
 # ============================================================================
 
-def get_current_error_rate() -> tuple[float, int, int]:
-    """
-    Calculate the current error rate from the sliding window.
-
-    Returns:
-        Tuple of (error_rate_percentage, error_count, total_count)
-    """
-    if len(request_window) == 0:
-        return 0.0, 0, 0
-
-    error_count = sum(1 for req in request_window if req.get('is_error', False))
-    total_count = len(request_window)
-    error_rate = (error_count / total_count) * 100
-
-    return error_rate, error_count, total_count
-
-
-def format_log_snippet(num_lines: int = 3, errors_only: bool = False) -> str:
-    """
-    Format recent log entries as a snippet showing structured fields.
-
-    Args:
-        num_lines: Number of log lines to include
-        errors_only: If True, only include error responses
+# Static Slack message scaffolding, built once and shared by every alert
+_EMOJI_MAP = {
+    'failover': '🔄',
+    'error_rate': '🚨',
+    'recovery': '✅'
+}
 
-    Returns:
-        Formatted log snippet string
-    """
-    if len(request_window) == 0:
-        return "_No recent requests_"
+_TITLE_MAP = {
+    'failover': 'FAILOVER DETECTED',
+    'error_rate': 'HIGH ERROR RATE ALERT',
+    'recovery': 'RECOVERY DETECTED'
+}
 
-    # Get recent requests (filter for errors if requested)
-    recent_requests = list(request_window)[-20:]  # Last 20 requests
-    if errors_only:
-        recent_requests = [req for req in recent_requests if req.get('is_error', False)]
+_DIVIDER = {"type": "divider"}
 
-    # Take the last num_lines
-    recent_requests = recent_requests[-num_lines:]
 
-    if not recent_requests:
-        return "_No matching requests_"
+def _header_block(emoji: str, title: str) -> Dict[str, Any]:
+    """Build a Slack header block."""
+    return {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": f"{emoji} {title}",
+            "emoji": True
+        }
+    }
 
-    # Format each request as a log line
-    lines = []
-    for req in recent_requests:
-        status_emoji = "🔴" if req.get('is_error', False) else "🟢"
-        log_line = (
-            f"{status_emoji} `pool={req.get('pool', '-')} "
-            f"release={req.get('release', '-')} "
-            f"status={req.get('status', '-')} "
-            f"upstream_status={req.get('upstream_status', '-')} "
-            f"upstream={req.get('upstream', '-')} "
-            f"request_time={req.get('request_time', '-')} "
-            f"upstream_response_time={req.get('upstream_response_time', '-')} "
-            f"method={req.get('method', '-')} "
-            f"uri={req.get('uri', '-')}`"
-        )
-        lines.append(log_line)
 
-    return "\n".join(lines)
+_HEADER_BLOCKS = {
+    alert_type: _header_block(_EMOJI_MAP[alert_type], title)
+    for alert_type, title in _TITLE_MAP.items()
+}
 
 
-def send_slack_alert(alert_type: str, message: str, details: Dict[str, Any]) -> bool:
+def send_slack_alert(
+    alert_type: str,
+    lazy_message: Callable[[], str],
+    lazy_details: Callable[[], Dict[str, Any]],
+    error_stats: tuple[float, int, int]
+) -> bool:
     """
     Send an alert to Slack using webhook.
+    The message is queued for the background worker; this call does not block on HTTP.
+    Message and details are only built once the alert has passed the
+    maintenance and cooldown gates, so suppressed alerts cost no formatting.
 
     Args:
         alert_type: Type of alert (failover, error_rate, recovery)
-        message: Main alert message
-        details: Additional details to include
+        lazy_message: Returns the main alert message
+        lazy_details: Returns additional details to include
+        error_stats: Window snapshot (error_rate_percentage, error_count, total_count)
 
     Returns:
-        True if alert sent successfully, False otherwise
+        True if alert was queued for sending, False otherwise
     """
     if not SLACK_WEBHOOK_URL:
-        print(f"[ALERT] {alert_type.upper()}: {message}")
-        print(f"[ALERT] Details: {details}")
-        print("[WARNING] SLACK_WEBHOOK_URL not configured - alert not sent to Slack")
+        log.warning("[ALERT] %s: %s", alert_type.upper(), lazy_message())
+        log.warning("[ALERT] Details: %s", lazy_details())
+        log.warning("[WARNING] SLACK_WEBHOOK_URL not configured - alert not sent to Slack")
         return False
 
     # Check if in maintenance mode
     if is_maintenance_mode():
-        print(f"[MAINTENANCE MODE] Alert suppressed: {alert_type}")
+        log.info("[MAINTENANCE MODE] Alert suppressed: %s", alert_type)
         return False
 
     # Check cooldown for all alert types to prevent spam
-    now = datetime.now()
-    last_alert = last_alert_times.get(alert_type, datetime.min)
-    cooldown_delta = timedelta(seconds=ALERT_COOLDOWN_SEC)
-
     # Apply cooldown to all alert types including error_rate
-    if now - last_alert < cooldown_delta:
-        remaining = (last_alert + cooldown_delta - now).total_seconds()
-        print(f"[COOLDOWN] Alert {alert_type} suppressed (cooldown: {remaining:.0f}s remaining)")
+    # (monotonic clock: a cheap float compare, immune to wall-clock jumps)
+    now = time.monotonic()
+    remaining = ALERT_COOLDOWN_SEC - (now - last_alert_times.get(alert_type, float('-inf')))
+    if remaining > 0:
+        log.debug("[COOLDOWN] Alert %s suppressed (cooldown: %.0fs remaining)", alert_type, remaining)
         return False
 
-    # Prepare Slack message with rich formatting
-    emoji_map = {
-        'failover': '🔄',
-        'error_rate': '🚨',
-        'recovery': '✅'
-    }
+    # The alert will be sent: build it now, while monitor state is current.
+    # error_stats is a snapshot taken by the caller; the worker thread
+    # must not read monitor state
+    message = lazy_message()
+    details = lazy_details()
+    log_snippet = details.pop('log_snippet', None)  # Get custom snippet if provided
 
-    title_map = {
-        'failover': 'FAILOVER DETECTED',
-        'error_rate': 'HIGH ERROR RATE ALERT',
-        'recovery': 'RECOVERY DETECTED'
-    }
+    # Hand off to the background worker; cooldown starts now so repeated
+    # events are suppressed while the message is still in flight
+    item: AlertItem = (alert_type, message, details, error_stats, log_snippet)
+    try:
+        _alert_q.put_nowait(item)
+    except queue.Full:
+        # Drop the oldest queued alert so the most recent state gets through;
+        # this thread is the only producer, so the retry cannot fail
+        dropped = _alert_q.get_nowait()
+        _alert_q.task_done()
+        assert dropped is not None  # The shutdown sentinel is only queued at exit
+        log.warning("[WARNING] Slack alert queue full - dropped oldest alert: %s", dropped[0])
+        _alert_q.put_nowait(item)
+
+    last_alert_times[alert_type] = now
+    return True
+
+
+def build_slack_message(
+    alert_type: str,
+    message: str,
+    details: Dict[str, Any],
+    error_stats: tuple[float, int, int],
+    log_snippet: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Build the Slack Block Kit payload for an alert.
+    Runs on the worker thread, only for alerts that passed every gate.
 
-    emoji = emoji_map.get(alert_type, '⚠️')
-    title = title_map.get(alert_type, alert_type.upper().replace('_', ' '))
+    Args:
+        alert_type: Type of alert (failover, error_rate, recovery)
+        message: Main alert message
+        details: Additional details to include
+        error_stats: (error_rate, error_count, total_count) at alert time
+        log_snippet: Formatted recent log entries, if any
 
-    # Get current error rate and log snippets
-    error_rate, error_count, total_count = get_current_error_rate()
-    log_snippet = details.pop('log_snippet', None)  # Get custom snippet if provided
+    Returns:
+        Slack webhook payload
+    """
+    header = _HEADER_BLOCKS.get(alert_type)
+    if header is None:
+        header = _header_block(_EMOJI_MAP.get(alert_type, '⚠️'), alert_type.upper().replace('_', ' '))
+
+    error_rate, error_count, total_count = error_stats
 
     # Build formatted message
     blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": f"{emoji} {title}",
-                "emoji": True
-            }
-        },
-        {
-            "type": "divider"
-        },
+        header,
+        _DIVIDER,
         {
             "type": "section",
             "text": {
@@ -244,9 +342,7 @@ def send_slack_alert(alert_type: str, message: str, details: Dict[str, Any]) ->
                 "text": message
             }
         },
-        {
-            "type": "divider"
-        },
+        _DIVIDER,
         {
             "type": "section",
             "fields": [
@@ -263,9 +359,7 @@ def send_slack_alert(alert_type: str, message: str, details: Dict[str, Any]) ->
     if total_count > 0:
         error_rate_emoji = "🔴" if error_rate > ERROR_RATE_THRESHOLD else "🟢"
         blocks.extend([
-            {
-                "type": "divider"
-            },
+            _DIVIDER,
             {
                 "type": "section",
                 "text": {
@@ -278,9 +372,7 @@ def send_slack_alert(alert_type: str, message: str, details: Dict[str, Any]) ->
     # Add log snippet section if available
     if log_snippet:
         blocks.extend([
-            {
-                "type": "divider"
-            },
+            _DIVIDER,
             {
                 "type": "section",
                 "text": {
@@ -292,9 +384,7 @@ def send_slack_alert(alert_type: str, message: str, details: Dict[str, Any]) ->
 
     # Add timestamp footer
     blocks.extend([
-        {
-            "type": "divider"
-        },
+        _DIVIDER,
         {
             "type": "context",
             "elements": [
@@ -307,28 +397,64 @@ def send_slack_alert(alert_type: str, message: str, details: Dict[str, Any]) ->
     ])
 
     slack_message = {
-        "text": f"{emoji} {title}",
+        "text": header["text"]["text"],
         "blocks": blocks
     }
 
-    # Send to Slack
-    try:
-        response = requests.post(
-            SLACK_WEBHOOK_URL,
-            json=slack_message,
-            timeout=10
-        )
-        response.raise_for_status()
+    return slack_message
 
-        # Update last alert time
-        last_alert_times[alert_type] = now
 
-        print(f"[SLACK] Alert sent successfully: {alert_type}")
-        return True
+def _alert_worker() -> None:
+    """
+    Build and post queued Slack alerts from a background thread.
+    The shared connection pool reuses the TCP/TLS connection across alerts.
+    """
+    while True:
+        item = _alert_q.get()
+        if item is None:  # Shutdown sentinel from _flush_alerts
+            _alert_q.task_done()
+            return
+
+        alert_type, message, details, error_stats, log_snippet = item
+        assert _slack_pool is not None  # Alerts are only queued with a webhook set
+        try:
+            slack_message = build_slack_message(alert_type, message, details, error_stats, log_snippet)
+            response = _slack_pool.urlopen(
+                'POST',
+                _slack_path,
+                body=json.dumps(slack_message).encode('utf-8'),
+                headers={'Content-Type': 'application/json'}
+            )
+
+            if response.status >= 400:
+                log.error("[ERROR] Failed to send Slack alert: HTTP %s %s", response.status, response.data.decode(errors='replace'))
+            else:
+                log.info("[SLACK] Alert sent successfully: %s", alert_type)
+
+        except Exception as e:
+            # Any failure only loses this alert; the worker must keep running
+            log.error("[ERROR] Failed to send Slack alert: %s", e)
+        finally:
+            _alert_q.task_done()
+
+
+_alert_thread = threading.Thread(target=_alert_worker, name='slack-alerts', daemon=True)
+_alert_thread.start()
+
+
+def _flush_alerts() -> None:
+    """
+    Let the worker send alerts still queued at exit, waiting at most
+    ALERT_FLUSH_TIMEOUT_SEC.
+    """
+    try:
+        _alert_q.put(None, timeout=ALERT_FLUSH_TIMEOUT_SEC)
+    except queue.Full:
+        return
+    _alert_thread.join(timeout=ALERT_FLUSH_TIMEOUT_SEC)
 
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Failed to send Slack alert: {e}")
-        return False
+
+atexit.register(_flush_alerts)
 
 
 # ============================================================================
@@ -345,15 +471,67 @@ def is_maintenance_mode() -> bool:
     Returns:
         True if maintenance mode is active
     """
+    global _maint_cache
+
     # Check environment variable
     if MAINTENANCE_MODE:
         return True
 
-    # Check flag file
-    if os.path.exists(MAINTENANCE_FLAG_FILE):
-        return True
+    # Check flag file, at most once per MAINTENANCE_CHECK_TTL_SEC
+    now = time.monotonic()
+    checked_at, flag_present = _maint_cache
+    if now - checked_at >= MAINTENANCE_CHECK_TTL_SEC:
+        flag_present = os.path.exists(MAINTENANCE_FLAG_FILE)
+        _maint_cache = (now, flag_present)
+
+    return flag_present
+
+
+def _get_breach_fh():
+    """
+    Return the breach log handle, opening it on first use.
+    The handle stays open between breaches, and is reopened if the file
+    was rotated or deleted since (the path no longer points to its inode).
+    Breaches are logged on every line while the error rate stays high, so
+    that check runs at most once per BREACH_FILE_CHECK_TTL_SEC.
+
+    Returns:
+        Line-buffered file handle opened for append
+    """
+    global _breach_fh, _breach_checked_at
+
+    now = time.monotonic()
+    if _breach_fh is not None and now - _breach_checked_at >= BREACH_FILE_CHECK_TTL_SEC:
+        _breach_checked_at = now
+        try:
+            rotated = os.stat(BREACH_LOG_FILE).st_ino != os.fstat(_breach_fh.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            _close_breach_fh()
+
+    if _breach_fh is None:
+        # Ensure state directory exists
+        os.makedirs(os.path.dirname(BREACH_LOG_FILE), exist_ok=True)
+        _breach_fh = open(BREACH_LOG_FILE, 'a', buffering=1)
+        _breach_checked_at = now
 
-    return False
+    return _breach_fh
+
+
+def _close_breach_fh() -> None:
+    """Close the breach log handle if it is open."""
+    global _breach_fh
+
+    if _breach_fh is not None:
+        try:
+            _breach_fh.close()
+        except OSError:
+            pass
+        _breach_fh = None
+
+
+atexit.register(_close_breach_fh)
 
 
 def log_error_rate_breach(error_rate: float, error_count: int, total_count: int, pool: str) -> None:
@@ -368,9 +546,10 @@ def log_error_rate_breach(error_rate: float, error_count: int, total_count: int,
         pool: Current pool serving requests
     """
     try:
+        now = datetime.now()
         breach_data = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'timestamp_iso': datetime.now().isoformat(),
+            'timestamp': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp_iso': now.isoformat(),
             'error_rate': round(error_rate, 2),
             'error_count': error_count,
             'total_count': total_count,
@@ -380,250 +559,678 @@ def log_error_rate_breach(error_rate: float, error_count: int, total_count: int,
             'exceeded_by': round(error_rate - ERROR_RATE_THRESHOLD, 2)
         }
 
-        # Ensure state directory exists
-        os.makedirs(os.path.dirname(BREACH_LOG_FILE), exist_ok=True)
-
         # Append breach record to log file (one JSON object per line)
-        with open(BREACH_LOG_FILE, 'a') as f:
-            f.write(json.dumps(breach_data) + '\n')
+        _get_breach_fh().write(json.dumps(breach_data) + '\n')
 
-        print(f"[BREACH LOGGED] {error_rate:.2f}% in {pool} pool (threshold: {ERROR_RATE_THRESHOLD}%)")
+        log.debug("[BREACH LOGGED] %.2f%% in %s pool (threshold: %s%%)", error_rate, pool, ERROR_RATE_THRESHOLD)
 
+    except OSError as e:
+        # Drop the handle so the next breach reopens the file
+        _close_breach_fh()
+        log.error("[ERROR] Failed to log breach to file: %s", e)
     except Exception as e:
-        print(f"[ERROR] Failed to log breach to file: {e}")
+        log.error("[ERROR] Failed to log breach to file: %s", e)
 
 
 # ============================================================================
 # MONITORING LOGIC
 # ============================================================================
 
-def check_failover(pool: str, release: str) -> None:
+class Monitor:
+    """
+    Failover, recovery and error-rate state machine fed one log entry at a time.
+    State lives in slotted instance attributes rather than module globals.
     """
-    Check if a failover has occurred (pool change).
 
-    Args:
-        pool: Current pool serving the request
-        release: Current release ID
+    __slots__ = (
+        'last_known_pool',     # Last pool seen, to detect changes
+        'failover_occurred',   # Whether we've seen a failover (to detect recovery)
+        'failover_from_pool',  # Pool that failed over
+        'error_count',         # 5xx entries currently in the window, maintained incrementally
+        'ring',                # Sliding error-rate window: one byte per request (1 = 5xx)
+        'head',                # Next ring slot to overwrite
+        'fill',                # Number of requests in the window, up to WINDOW_SIZE
+        'history',             # Recent requests, kept only for rendering log snippets
+    )
+
+    def __init__(self) -> None:
+        self.last_known_pool: Optional[str] = None
+        self.failover_occurred: bool = False
+        self.failover_from_pool: Optional[str] = None
+        self.error_count: int = 0
+        self.ring: bytearray = bytearray(WINDOW_SIZE)
+        self.head: int = 0
+        self.fill: int = 0
+        self.history: "deque[WindowEntry]" = deque(maxlen=SNIPPET_HISTORY)
+
+    def get_current_error_rate(self) -> tuple[float, int, int]:
+        """
+        Calculate the current error rate from the sliding window.
+
+        Returns:
+            Tuple of (error_rate_percentage, error_count, total_count)
+        """
+        fill = self.fill
+        if fill == 0:
+            return 0.0, 0, 0
+
+        error_count = self.error_count
+        error_rate = (error_count / fill) * 100
+
+        return error_rate, error_count, fill
+
+    def format_log_snippet(self, num_lines: int = 3, errors_only: bool = False) -> str:
+        """
+        Format recent log entries as a snippet showing structured fields.
+
+        Args:
+            num_lines: Number of log lines to include
+            errors_only: If True, only include error responses
+
+        Returns:
+            Formatted log snippet string
+        """
+        if len(self.history) == 0:
+            return "_No recent requests_"
+
+        # Walk back from the newest entry, stopping once enough matching
+        # entries are collected
+        recent_requests = []
+        for req in reversed(self.history):
+            if errors_only and not req.is_error:
+                continue
+            recent_requests.append(req)
+            if len(recent_requests) == num_lines:
+                break
+        recent_requests.reverse()
+
+        if not recent_requests:
+            return "_No matching requests_"
+
+        # Format each request as a log line
+        lines = []
+        for req in recent_requests:
+            status_emoji = "🔴" if req.is_error else "🟢"
+            log_line = (
+                f"{status_emoji} `pool={req.pool} "
+                f"release={req.release} "
+                f"status={req.status} "
+                f"upstream_status={req.upstream_status} "
+                f"upstream={req.upstream} "
+                f"request_time={req.request_time} "
+                f"upstream_response_time={req.upstream_response_time} "
+                f"method={req.method} "
+                f"uri={req.uri}`"
+            )
+            lines.append(log_line)
+
+        return "\n".join(lines)
+
+    def check_failover(self, pool: str, release: str) -> None:
+        """
+        Check if a failover has occurred (pool change).
+
+        Args:
+            pool: Current pool serving the request
+            release: Current release ID
+        """
+        # Skip if pool is unknown or empty
+        if not pool or pool == '-':
+            return
+
+        last_known_pool = self.last_known_pool
+
+        # Initialize on first valid pool
+        if last_known_pool is None:
+            self.last_known_pool = pool
+            log.info("[INIT] Initial pool detected: %s", pool)
+            return
+
+        # Check if pool has changed
+        if pool != last_known_pool:
+            log.warning("[FAILOVER DETECTED] %s → %s", last_known_pool, pool)
+
+            # Send Slack alert; the log snippet shows recent errors and the failover
+            send_slack_alert(
+                alert_type='failover',
+                lazy_message=lambda: f"*Failover Event Detected!*\n\nTraffic has automatically switched from the *{last_known_pool.upper()}* pool to the *{pool.upper()}* pool. The {last_known_pool} pool is experiencing failures or health check issues.\n\n_The backup pool is now serving all incoming requests._",
+                lazy_details=lambda: {
+                    "From Pool": last_known_pool.upper(),
+                    "To Pool": pool.upper(),
+                    "New Release": release,
+                    "Status": f"⚠️ {last_known_pool.upper()} pool unhealthy, {pool.upper()} pool active",
+                    "Action Required": f"Investigate {last_known_pool} pool health immediately",
+                    "Debug Command": f"`docker logs app_{last_known_pool}`",
+                    "log_snippet": self.format_log_snippet(num_lines=3, errors_only=False)
+                },
+                error_stats=self.get_current_error_rate()
+            )
+
+            # Track failover state
+            self.failover_occurred = True
+            self.failover_from_pool = last_known_pool
+            self.last_known_pool = pool
+
+    def check_recovery(self, pool: str, release: str) -> None:
+        """
+        Check if recovery has occurred (return to original pool).
+
+        Args:
+            pool: Current pool serving the request
+            release: Current release ID
+        """
+        # Only check recovery if a failover occurred
+        failover_from_pool = self.failover_from_pool
+        if not self.failover_occurred or not failover_from_pool:
+            return
+
+        # Check if we've returned to the original pool
+        if pool == failover_from_pool:
+            log.info("[RECOVERY DETECTED] Returned to %s", pool)
+
+            # A failover always records the pool it switched to
+            backup_pool = self.last_known_pool
+            assert backup_pool is not None
+
+            # Send Slack alert; the log snippet shows the recovery
+            send_slack_alert(
+                alert_type='recovery',
+                lazy_message=lambda: f"*Recovery Complete!*\n\nThe *{pool.upper()}* pool has recovered and is now serving traffic again. The system has automatically failed back to the primary pool.\n\n_Normal operations resumed._",
+                lazy_details=lambda: {
+                    "Recovered Pool": pool.upper(),
+                    "Release": release,
+                    "Status": "✅ Primary pool healthy and active",
+                    "Previous State": f"Was using {backup_pool.upper()} as backup",
+                    "Action": "Continue monitoring for stability",
+                    "log_snippet": self.format_log_snippet(num_lines=3, errors_only=False)
+                },
+                error_stats=self.get_current_error_rate()
+            )
+
+            # Reset failover state
+            self.failover_occurred = False
+            self.failover_from_pool = None
+
+    def check_error_rate(self) -> None:
+        """
+        Check if error rate exceeds threshold over the sliding window.
+        """
+        # Require minimum 10 requests before checking error rate
+        # This is ~5% of the default 200-request window
+        MIN_REQUESTS_FOR_CHECK = 10
+
+        fill = self.fill
+        if fill < MIN_REQUESTS_FOR_CHECK:
+            # Not enough data yet
+            return
+
+        # Full window (steady state): a single integer compare decides
+        if fill == WINDOW_SIZE and self.error_count < _ERROR_COUNT_TRIGGER:
+            return
+
+        error_stats = self.get_current_error_rate()
+        error_rate, error_count, _ = error_stats
+
+        if error_rate > ERROR_RATE_THRESHOLD:
+            log.warning("[HIGH ERROR RATE] %.2f%% (threshold: %s%%)", error_rate, ERROR_RATE_THRESHOLD)
+
+            # Get current pool from most recent request
+            current_pool = self.history[-1].pool
+
+            # Log breach to persistent file BEFORE cooldown check
+            # This ensures we capture ALL threshold breaches, even during cooldown
+            log_error_rate_breach(error_rate, error_count, fill, current_pool)
+
+            # Send Slack alert (subject to cooldown); the log snippet shows
+            # error responses only
+            send_slack_alert(
+                alert_type='error_rate',
+                lazy_message=lambda: f"*High Error Rate Detected!*\n\nThe current error rate is *{error_rate:.2f}%* which exceeds the configured threshold of *{ERROR_RATE_THRESHOLD}%*.\n\n_This indicates the {current_pool.upper()} pool is experiencing issues and returning 5xx errors._",
+                lazy_details=lambda: {
+                    "Current Error Rate": f"🔴 {error_rate:.2f}%",
+                    "Threshold": f"{ERROR_RATE_THRESHOLD}%",
+                    "Window Size": f"{WINDOW_SIZE} requests",
+                    "Error Count": f"{error_count} errors out of {fill} requests",
+                    "Current Pool": current_pool.upper(),
+                    "Severity": "⚠️ High - Immediate attention required",
+                    "Action Required": "Check application logs and consider manual pool toggle",
+                    "Debug Command": f"`docker logs app_{current_pool}`",
+                    "log_snippet": self.format_log_snippet(num_lines=5, errors_only=True)
+                },
+                error_stats=error_stats
+            )
+
+    def on_entry(self, data: Dict[str, Any]) -> None:
+        """
+        Process a parsed log entry and perform all monitoring checks.
+
+        Args:
+            data: Parsed log data dictionary
+        """
+        pool: str = data['pool']
+        release: str = data['release']
+        status: str = data['status']
+        is_error: bool = data['is_error']
+
+        # Overwrite the oldest slot in the error ring, adjusting the count in O(1)
+        ring = self.ring
+        head = self.head
+        bit = 1 if is_error else 0
+        self.error_count += bit - ring[head]
+        ring[head] = bit
+        self.head = (head + 1) % WINDOW_SIZE
+        if self.fill < WINDOW_SIZE:
+            self.fill += 1
+
+        # Add to snippet history
+        self.history.append(WindowEntry(
+            pool=pool,
+            release=release,
+            status=status,
+            is_error=is_error,
+            upstream_status=data['upstream_status'],
+            request_time=data['request_time'],
+            upstream_response_time=data['upstream_response_time'],
+            method=data['method'],
+            uri=data['uri'],
+            upstream=data['upstream']
+        ))
+
+        # Check for failover
+        self.check_failover(pool, release)
+
+        # Check for recovery
+        self.check_recovery(pool, release)
+
+        # Check error rate
+        self.check_error_rate()
+
+
+# The watcher's single monitor instance, fed by the log tailing loop
+monitor = Monitor()
+
+# ============================================================================
+# INOTIFY
+# ============================================================================
+
+# Event masks from <sys/inotify.h>
+IN_MODIFY: Final[int] = 0x00000002
+IN_ATTRIB: Final[int] = 0x00000004
+IN_MOVED_TO: Final[int] = 0x00000080
+IN_CREATE: Final[int] = 0x00000100
+IN_DELETE_SELF: Final[int] = 0x00000400
+IN_MOVE_SELF: Final[int] = 0x00000800
+
+# struct inotify_event header: wd, mask, cookie, len (followed by len bytes of name)
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+_libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+
+def _raise_libc_error(path: Optional[str] = None) -> None:
+    """Raise OSError for the errno left by the last failing libc call."""
+    err = ctypes.get_errno()
+    raise OSError(err, os.strerror(err), path)
+
+
+def inotify_init() -> int:
     """
-    global last_known_pool, failover_occurred, failover_from_pool
+    Create a non-blocking inotify instance.
 
-    # Skip if pool is unknown or empty
-    if not pool or pool == '-':
-        return
+    Returns:
+        File descriptor of the new inotify instance
+    """
+    # IN_NONBLOCK / IN_CLOEXEC share their values with O_NONBLOCK / O_CLOEXEC
+    fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        _raise_libc_error()
+    return fd
 
-    # Initialize on first valid pool
-    if last_known_pool is None:
-        last_known_pool = pool
-        print(f"[INIT] Initial pool detected: {pool}")
-        return
 
-    # Check if pool has changed
-    if pool != last_known_pool:
-        print(f"[FAILOVER DETECTED] {last_known_pool} → {pool}")
-
-        # Get log snippet showing recent errors and the failover
-        log_snippet = format_log_snippet(num_lines=3, errors_only=False)
-
-        # Send Slack alert
-        send_slack_alert(
-            alert_type='failover',
-            message=f"*Failover Event Detected!*\n\nTraffic has automatically switched from the *{last_known_pool.upper()}* pool to the *{pool.upper()}* pool. The {last_known_pool} pool is experiencing failures or health check issues.\n\n_The backup pool is now serving all incoming requests._",
-            details={
-                "From Pool": last_known_pool.upper(),
-                "To Pool": pool.upper(),
-                "New Release": release,
-                "Status": f"⚠️ {last_known_pool.upper()} pool unhealthy, {pool.upper()} pool active",
-                "Action Required": f"Investigate {last_known_pool} pool health immediately",
-                "Debug Command": f"`docker logs app_{last_known_pool}`",
-                "log_snippet": log_snippet
-            }
-        )
+def inotify_add_watch(fd: int, path: str, mask: int) -> int:
+    """
+    Watch a path for the given events.
+
+    Args:
+        fd: inotify file descriptor
+        path: File or directory to watch
+        mask: Bitmask of IN_* events
+
+    Returns:
+        Watch descriptor
+    """
+    wd = _libc.inotify_add_watch(fd, os.fsencode(path), ctypes.c_uint32(mask))
+    if wd < 0:
+        _raise_libc_error(path)
+    return wd
 
-        # Track failover state
-        failover_occurred = True
-        failover_from_pool = last_known_pool
-        last_known_pool = pool
+
+def inotify_rm_watch(fd: int, wd: int) -> None:
+    """
+    Remove a watch. Errors are ignored since the kernel drops watches on
+    deleted files by itself.
+
+    Args:
+        fd: inotify file descriptor
+        wd: Watch descriptor to remove
+    """
+    _libc.inotify_rm_watch(fd, wd)
 
 
-def check_recovery(pool: str, release: str) -> None:
+def inotify_read_events(fd: int) -> list[tuple[int, int, str]]:
     """
-    Check if recovery has occurred (return to original pool).
+    Wait until inotify events are available, then drain and decode all
+    queued events.
 
     Args:
-        pool: Current pool serving the request
-        release: Current release ID
+        fd: Non-blocking inotify file descriptor
+
+    Returns:
+        List of (watch descriptor, event mask, name) tuples
     """
-    global failover_occurred, failover_from_pool
+    select.select([fd], [], [])
+
+    events = []
+    while True:
+        try:
+            buf = os.read(fd, 4096)
+        except BlockingIOError:
+            break
+
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, name_len = _INOTIFY_EVENT.unpack_from(buf, offset)
+            offset += _INOTIFY_EVENT.size
+            name = buf[offset:offset + name_len].rstrip(b'\0').decode(errors='replace')
+            offset += name_len
+            events.append((wd, mask, name))
 
-    # Only check recovery if a failover occurred
-    if not failover_occurred or not failover_from_pool:
+    return events
+
+
+# ============================================================================
+# LOG TAILING
+# ============================================================================
+
+def wait_for_log_file(log_file: str, inotify_fd: Optional[int] = None) -> None:
+    """
+    Block until the log file exists.
+    With inotify, sleeps until a file is created or moved into the log
+    directory; otherwise polls every 5 seconds.
+
+    Args:
+        log_file: Path to the log file
+        inotify_fd: inotify file descriptor, or None to poll
+    """
+    if inotify_fd is not None:
+        # The directory watch is left in place; follow_log_inotify adds the
+        # same watch again, which reuses it. The file is checked only after
+        # the watch exists, so a file created in between is not missed.
+        # A directory that does not exist yet cannot be watched, so poll
+        # for it first.
+        while True:
+            try:
+                inotify_add_watch(inotify_fd, os.path.dirname(log_file) or '.', IN_CREATE | IN_MOVED_TO)
+                break
+            except FileNotFoundError:
+                log.info("[WAITING] Log file not found: %s", log_file)
+                time.sleep(5)
+
+        if not os.path.exists(log_file):
+            log.info("[WAITING] Log file not found: %s", log_file)
+            while not os.path.exists(log_file):
+                inotify_read_events(inotify_fd)
         return
 
-    # Check if we've returned to the original pool
-    if pool == failover_from_pool:
-        print(f"[RECOVERY DETECTED] Returned to {pool}")
-
-        # Get log snippet showing the recovery
-        log_snippet = format_log_snippet(num_lines=3, errors_only=False)
-
-        # Send Slack alert
-        send_slack_alert(
-            alert_type='recovery',
-            message=f"*Recovery Complete!*\n\nThe *{pool.upper()}* pool has recovered and is now serving traffic again. The system has automatically failed back to the primary pool.\n\n_Normal operations resumed._",
-            details={
-                "Recovered Pool": pool.upper(),
-                "Release": release,
-                "Status": "✅ Primary pool healthy and active",
-                "Previous State": f"Was using {last_known_pool.upper()} as backup",
-                "Action": "Continue monitoring for stability",
-                "log_snippet": log_snippet
-            }
-        )
+    while not os.path.exists(log_file):
+        log.info("[WAITING] Log file not found: %s", log_file)
+        time.sleep(5)
+
 
-        # Reset failover state
-        failover_occurred = False
-        failover_from_pool = None
+def read_new_lines(log_fh, pending: bytes, _buf=bytearray(READ_CHUNK_SIZE)) -> bytes:
+    """
+    Queue every complete line appended to the log since the last read.
+    Data is read straight into a reusable buffer, READ_CHUNK_SIZE bytes per
+    read() syscall; a short read means EOF, so no extra syscall is spent
+    confirming it. Complete lines go to the parser thread (see
+    process_batches) as one block per read; this blocks while the queue
+    is full.
+
+    Args:
+        log_fh: Unbuffered binary log file, positioned at the last read offset
+        pending: Incomplete trailing line left over from the previous read
+
+    Returns:
+        Incomplete trailing line to carry over to the next read
+    """
+    put = _batch_q.put
 
+    while True:
+        size = log_fh.readinto(_buf)
+        if not size:
+            return pending
 
-def check_error_rate() -> None:
+        complete, newline, pending = (pending + _buf[:size]).rpartition(b'\n')
+        if newline:
+            put(complete)
+
+        if size < len(_buf):
+            return pending
+
+
+def process_batches() -> None:
     """
-    Check if error rate exceeds threshold over the sliding window.
+    Parser thread: decode, parse and monitor blocks of log lines queued by
+    read_new_lines, in order, until a None sentinel is received.
     """
-    # Require minimum 10 requests before checking error rate
-    # This is ~5% of the default 200-request window
-    MIN_REQUESTS_FOR_CHECK = 10
+    get = _batch_q.get
+    parse = parse_log_line
+    process = monitor.on_entry
+
+    while True:
+        block = get()
+        if block is None:
+            return
+
+        try:
+            # Decode all complete lines in one call rather than once per line
+            for line in block.decode('utf-8', errors='replace').split('\n'):
+                data = parse(line)
+                if data:
+                    process(data)
+        except Exception as e:
+            # Keep consuming; a dead parser thread would stall the tail loop
+            log.error("[ERROR] Failed to process log lines: %s", e)
+
+
+def open_log(log_file: str):
+    """
+    Open the log file for unbuffered binary reading.
+    The kernel is told the file will be read sequentially, so it uses a
+    larger readahead window. Called again for each file after rotation.
 
-    if len(request_window) < MIN_REQUESTS_FOR_CHECK:
-        # Not enough data yet
-        return
+    Args:
+        log_file: Path to the log file
 
-    # Count 5xx errors in the window
-    error_count = sum(1 for req in request_window if req.get('is_error', False))
-    error_rate = (error_count / len(request_window)) * 100
-
-    if error_rate > ERROR_RATE_THRESHOLD:
-        print(f"[HIGH ERROR RATE] {error_rate:.2f}% (threshold: {ERROR_RATE_THRESHOLD}%)")
-
-        # Get current pool from most recent request
-        current_pool = request_window[-1].get('pool', 'unknown')
-
-        # Log breach to persistent file BEFORE cooldown check
-        # This ensures we capture ALL threshold breaches, even during cooldown
-        log_error_rate_breach(error_rate, error_count, len(request_window), current_pool)
-
-        # Get log snippet showing error responses only
-        log_snippet = format_log_snippet(num_lines=5, errors_only=True)
-
-        # Send Slack alert (subject to cooldown)
-        send_slack_alert(
-            alert_type='error_rate',
-            message=f"*High Error Rate Detected!*\n\nThe current error rate is *{error_rate:.2f}%* which exceeds the configured threshold of *{ERROR_RATE_THRESHOLD}%*.\n\n_This indicates the {current_pool.upper()} pool is experiencing issues and returning 5xx errors._",
-            details={
-                "Current Error Rate": f"🔴 {error_rate:.2f}%",
-                "Threshold": f"{ERROR_RATE_THRESHOLD}%",
-                "Window Size": f"{WINDOW_SIZE} requests",
-                "Error Count": f"{error_count} errors out of {len(request_window)} requests",
-                "Current Pool": current_pool.upper(),
-                "Severity": "⚠️ High - Immediate attention required",
-                "Action Required": "Check application logs and consider manual pool toggle",
-                "Debug Command": f"`docker logs app_{current_pool}`",
-                "log_snippet": log_snippet
-            }
-        )
+    Returns:
+        Unbuffered binary file handle at offset 0
+    """
+    fd = os.open(log_file, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except (OSError, AttributeError):
+        pass  # Only a hint; not supported on every platform or filesystem
+    return open(fd, 'rb', buffering=0)
+
+
+def open_watched_log(log_file: str, inotify_fd: int) -> tuple[Any, int]:
+    """
+    Open the log file for reading and add an inotify watch on it.
+
+    Args:
+        log_file: Path to the log file
+        inotify_fd: inotify file descriptor
+
+    Returns:
+        Tuple of (unbuffered binary file handle at offset 0, watch descriptor)
+    """
+    log_fh = open_log(log_file)
+    watch = inotify_add_watch(inotify_fd, log_file, IN_MODIFY | IN_ATTRIB | IN_MOVE_SELF | IN_DELETE_SELF)
+    return log_fh, watch
 
 
-def process_log_entry(data: Dict[str, Any]) -> None:
+def follow_log_inotify(log_file: str, inotify_fd: int) -> None:
     """
-    Process a parsed log entry and perform all monitoring checks.
+    Follow the log file using inotify, sleeping until Nginx writes to it.
+    Handles rotation by move, delete or truncate: the log directory is
+    watched too, so a replacement file is picked up as soon as it is
+    created. Runs until interrupted.
 
     Args:
-        data: Parsed log data dictionary
+        log_file: Path to the log file to follow
+        inotify_fd: inotify file descriptor (closed on return)
     """
-    pool = data.get('pool', '-')
-    release = data.get('release', '-')
-    status = data.get('status', 0)
+    log_dir, log_name = os.path.split(log_file)
+    dir_watch = inotify_add_watch(inotify_fd, log_dir or '.', IN_CREATE | IN_MOVED_TO)
+
+    # Start at the end of the file, like tail -n 0
+    log_fh, watch = open_watched_log(log_file, inotify_fd)
+    log_fh.seek(0, os.SEEK_END)
+    pending = b''
 
-    # Determine if this is an error (5xx status)
-    is_error = 500 <= status < 600
+    try:
+        while True:
+            for wd, mask, name in inotify_read_events(inotify_fd):
+                # A new log file appeared - switch to it if the old one is gone
+                if wd == dir_watch:
+                    if name == log_name and log_fh is None:
+                        log.info("[ROTATE] New log file created, reopening")
+                        log_fh, watch = open_watched_log(log_file, inotify_fd)
+                        pending = read_new_lines(log_fh, b'')
+                    continue
+
+                # Ignore events still queued for a previous (rotated) file
+                if log_fh is None or wd != watch:
+                    continue
+
+                stat = os.fstat(log_fh.fileno())
+
+                # File truncated in place (copytruncate) - start over from the top
+                if stat.st_size < log_fh.tell():
+                    log.info("[ROTATE] Log file truncated, reading from start")
+                    log_fh.seek(0)
+                    pending = b''
+
+                pending = read_new_lines(log_fh, pending)
+
+                # File moved or unlinked - drop it and wait for the replacement
+                if mask & (IN_MOVE_SELF | IN_DELETE_SELF) or stat.st_nlink == 0:
+                    log.info("[ROTATE] Log file rotated, waiting for new file")
+                    inotify_rm_watch(inotify_fd, watch)
+                    log_fh.close()
+                    log_fh = None
+
+                    # The replacement may already exist (its IN_CREATE was queued
+                    # earlier); otherwise the directory watch will report it
+                    if os.path.exists(log_file):
+                        log_fh, watch = open_watched_log(log_file, inotify_fd)
+                        pending = read_new_lines(log_fh, b'')
+    finally:
+        if log_fh is not None:
+            log_fh.close()
+        os.close(inotify_fd)
 
-    # Add to sliding window (including raw log line for snippets)
-    request_window.append({
-        'pool': pool,
-        'release': release,
-        'status': status,
-        'is_error': is_error,
-        'timestamp': data.get('time', ''),
-        'upstream_status': data.get('upstream_status', '-'),
-        'request_time': data.get('request_time', '-'),
-        'upstream_response_time': data.get('upstream_response_time', '-'),
-        'method': data.get('method', '-'),
-        'uri': data.get('uri', '-'),
-        'upstream': data.get('upstream', '-')
-    })
 
-    # Check for failover
-    check_failover(pool, release)
+def follow_log_polling(log_file: str, interval: float = 0.2) -> None:
+    """
+    Follow the log file by polling, for systems without inotify.
+    Rotation is detected by comparing inode numbers. Runs until interrupted.
 
-    # Check for recovery
-    check_recovery(pool, release)
+    Args:
+        log_file: Path to the log file to follow
+        interval: Seconds to sleep when no new data is available
+    """
+    # Start at the end of the file, like tail -n 0
+    log_fh = open_log(log_file)
+    log_fh.seek(0, os.SEEK_END)
+    pending = b''
 
-    # Check error rate
-    check_error_rate()
+    try:
+        while True:
+            offset = log_fh.tell()
+            pending = read_new_lines(log_fh, pending)
+            if log_fh.tell() != offset:
+                continue
 
+            time.sleep(interval)
+
+            try:
+                stat = os.stat(log_file)
+            except FileNotFoundError:
+                continue  # Mid-rotation; keep reading the old file until a new one appears
+
+            # File truncated in place (copytruncate) - start over from the top
+            if stat.st_ino == os.fstat(log_fh.fileno()).st_ino:
+                if stat.st_size < log_fh.tell():
+                    log.info("[ROTATE] Log file truncated, reading from start")
+                    log_fh.seek(0)
+                    pending = b''
+                continue
+
+            # A new file replaced the one we are reading - drain the old one and switch
+            log.info("[ROTATE] Log file rotated, reopening")
+            read_new_lines(log_fh, pending)
+            log_fh.close()
+            log_fh = open_log(log_file)
+            pending = b''
+    finally:
+        log_fh.close()
 
-# ============================================================================
-# LOG TAILING
-# ============================================================================
 
 def tail_log_file(log_file: str) -> None:
     """
     Tail the log file and process entries in real-time.
+    Uses inotify where available and falls back to polling otherwise.
 
     Args:
         log_file: Path to the log file to tail
     """
-    print(f"[START] Watching log file: {log_file}")
-    print(f"[CONFIG] Error threshold: {ERROR_RATE_THRESHOLD}%, Window: {WINDOW_SIZE}, Cooldown: {ALERT_COOLDOWN_SEC}s")
-    print(f"[CONFIG] Maintenance mode: {is_maintenance_mode()}")
+    log.info("[START] Watching log file: %s", log_file)
+    log.info("[CONFIG] Error threshold: %s%%, Window: %s, Cooldown: %ss", ERROR_RATE_THRESHOLD, WINDOW_SIZE, ALERT_COOLDOWN_SEC)
+    log.info("[CONFIG] Maintenance mode: %s", is_maintenance_mode())
 
     if not SLACK_WEBHOOK_URL:
-        print("[WARNING] SLACK_WEBHOOK_URL is not configured - alerts will only be logged to console")
+        log.warning("[WARNING] SLACK_WEBHOOK_URL is not configured - alerts will only be logged to console")
 
-    # Wait for log file to be created
-    while not os.path.exists(log_file):
-        print(f"[WAITING] Log file not found: {log_file}")
-        time.sleep(5)
+    parser = threading.Thread(target=process_batches, name='log-parser', daemon=True)
+    parser.start()
 
-    print(f"[READY] Log file found, starting to tail...")
+    try:
+        try:
+            inotify_fd: Optional[int] = inotify_init()
+        except (OSError, AttributeError) as e:
+            log.warning("[WARNING] inotify unavailable (%s) - falling back to polling", e)
+            inotify_fd = None
 
-    # Use tail -F to follow the log file (handles log rotation)
-    process = subprocess.Popen(
-        ['tail', '-F', '-n', '0', log_file],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        universal_newlines=True,
-        bufsize=1
-    )
+        # Wait for log file to be created
+        wait_for_log_file(log_file, inotify_fd)
 
-    try:
-        # Process each line as it arrives
-        for line in iter(process.stdout.readline, ''):
-            if not line:
-                continue
+        log.info("[READY] Log file found, starting to tail...")
 
-            # Parse the log line
-            data = parse_log_line(line)
-            if data:
-                process_log_entry(data)
+        if inotify_fd is None:
+            follow_log_polling(log_file)
+        else:
+            follow_log_inotify(log_file, inotify_fd)
 
     except KeyboardInterrupt:
-        print("\n[SHUTDOWN] Received interrupt signal")
+        log.info("[SHUTDOWN] Received interrupt signal")
     except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
+        log.error("[ERROR] Unexpected error: %s", e)
     finally:
-        process.terminate()
-        process.wait()
-        print("[SHUTDOWN] Watcher stopped")
+        # Let the parser finish the lines already read
+        _batch_q.put(None)
+        parser.join()
+        log.info("[SHUTDOWN] Watcher stopped")
 
 
 # ============================================================================
@@ -632,18 +1239,18 @@ def tail_log_file(log_file: str) -> None:
 
 def main():
     """Main entry point for the log watcher."""
-    print("=" * 80)
-    print("NGINX LOG WATCHER - Blue/Green Deployment Monitor")
-    print("=" * 80)
+    log.info("=" * 80)
+    log.info("NGINX LOG WATCHER - Blue/Green Deployment Monitor")
+    log.info("=" * 80)
 
     # Validate configuration
     if not SLACK_WEBHOOK_URL:
-        print("[WARNING] SLACK_WEBHOOK_URL not configured - running in console-only mode")
+        log.warning("[WARNING] SLACK_WEBHOOK_URL not configured - running in console-only mode")
 
     try:
         tail_log_file(LOG_FILE)
     except Exception as e:
-        print(f"[FATAL ERROR] {e}")
+        log.critical("[FATAL ERROR] %s", e)
         sys.exit(1)
 
 